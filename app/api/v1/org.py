@@ -1,111 +1,147 @@
+import asyncio
+
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from bson import ObjectId
-from datetime import timedelta
+from pymongo.errors import DuplicateKeyError
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from app.core.db import get_master_db, get_mongo_client
 from app.core.security import (
     get_password_hash, verify_password, create_access_token, get_current_org_id
 )
-from app.models.organization import OrganizationCreate, OrganizationDB, OrganizationOut
-from app.models.user import AdminCreate, AdminDB, AdminLogin, Token
+from app.models.organization import OrganizationCreate, OrganizationOut
+from app.models.user import AdminCreate, AdminLogin, Token
 from app.core.config import settings
 
 router = APIRouter(prefix="/org", tags=["Organization Management"])
 
-# --- Helper for Admin Creation (Used by Org Create) ---
-async def create_admin_user(email: str, password: str, org_id: ObjectId):
-    """Creates the admin user and stores them in the Master DB."""
-    master_db = get_master_db()
-    
-    # 1. Check if user already exists (globally)
-    if await master_db["master_users"].find_one({"email": email}):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Admin email already registered for another organization"
-        )
+# Projections keep find_one results to the fields the endpoints actually
+# use, instead of shipping whole documents over the wire.
+_ORG_PROJECTION = {"_id": 1, "organization_name": 1, "collection_name": 1, "admin_user_id": 1}
+_LOGIN_PROJECTION = {"_id": 1, "hashed_password": 1, "org_id": 1}
 
-    # 2. Hash password and create user record
-    hashed_password = get_password_hash(password)
-    admin_db_model = AdminDB(
-        email=email,
-        hashed_password=hashed_password,
-        org_id=org_id
-    )
-    
-    # 3. Insert admin user
-    result = await master_db["master_users"].insert_one(admin_db_model.model_dump(by_alias=True))
-    return result.inserted_id
+def _collection_name(name: str) -> str:
+    """Normalizes an organization name into its tenant collection name."""
+    return "org_" + name.strip().lower().replace(' ', '_')
+
+# --- Helper for Organization Responses ---
+def _org_response(org: dict, status_code: int = status.HTTP_200_OK) -> ORJSONResponse:
+    """Serializes an organization document directly into the response.
 
+    Returning a Response instance skips FastAPI's re-validation of the
+    document against the response_model (the schema is still advertised
+    in the OpenAPI docs via the decorator).
+    """
+    return ORJSONResponse(
+        {
+            "_id": str(org["_id"]),
+            "organization_name": org["organization_name"],
+            "collection_name": org["collection_name"],
+            "admin_user_id": str(org["admin_user_id"]),
+        },
+        status_code=status_code,
+    )
 
 # --- Functional Requirement 1: Create Organization (POST /org/create) ---
 @router.post("/create", response_model=OrganizationOut, status_code=status.HTTP_201_CREATED)
 async def create_organization(
     org_data: OrganizationCreate,
-    admin_data: AdminCreate
+    admin_data: AdminCreate,
+    master_db=Depends(get_master_db),
+    mongo_client=Depends(get_mongo_client)
 ):
-    master_db = get_master_db()
-    
-    # 1. Validate organization name uniqueness
-    if await master_db["organizations"].find_one({"organization_name": org_data.organization_name}):
+    # 1. Prepare dynamic collection name and pre-generate both ObjectIds
+    # client-side, so the org can be inserted with its real admin_user_id
+    # and no follow-up update or refetch is needed.
+    collection_name = _collection_name(org_data.organization_name)
+    org_id = ObjectId()
+    admin_id = ObjectId()
+
+    # 2. Insert the organization document first: the unique indexes on
+    # organization_name and collection_name reject duplicate (or
+    # normalized-colliding) names with a DuplicateKeyError before any
+    # side-effecting work runs, so a taken name is a clean 400. The insert
+    # documents are built as plain dicts — the fields are already local and
+    # typed, so a Pydantic serialization pass would add nothing, and BSON
+    # encodes the ObjectIds natively.
+    org_doc = {
+        "_id": org_id,
+        "organization_name": org_data.organization_name,
+        "collection_name": collection_name,
+        "admin_user_id": admin_id,
+        "created_at": datetime.now(timezone.utc),
+    }
+    try:
+        await master_db["organizations"].insert_one(org_doc)
+    except DuplicateKeyError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Organization name already exists"
         )
-    
-    # 2. Prepare dynamic collection name
-    collection_name = f"org_{org_data.organization_name.lower().replace(' ', '_')}"
-    
-    # 3. Create the initial organization document in Master DB (before admin)
-    org_db_model = OrganizationDB(
-        organization_name=org_data.organization_name,
-        collection_name=collection_name,
-        admin_user_id=ObjectId() # Temporary dummy ID
-    )
-    org_result = await master_db["organizations"].insert_one(org_db_model.model_dump(exclude={"admin_user_id"}, by_alias=True))
-    org_id = org_result.inserted_id
-    
-    # 4. Create the Admin User associated with the new Org ID
-    admin_id = await create_admin_user(admin_data.email, admin_data.password, org_id)
-    
-    # 5. Update the Organization document with the correct admin_user_id
-    await master_db["organizations"].update_one(
-        {"_id": org_id},
-        {"$set": {"admin_user_id": admin_id}}
+
+    # 3. Insert the Admin User and create the tenant collection concurrently:
+    # they are independent of each other, so the round-trips overlap instead
+    # of running back-to-back. The unique index on email enforces global
+    # uniqueness.
+    hashed_password = await get_password_hash(admin_data.password)
+    admin_doc = {
+        "_id": admin_id,
+        "email": admin_data.email,
+        "hashed_password": hashed_password,
+        "org_id": org_id,
+    }
+    admin_result, collection_result = await asyncio.gather(
+        master_db["master_users"].insert_one(admin_doc),
+        mongo_client[settings.MASTER_DB_NAME].create_collection(collection_name),
+        # Collect both outcomes instead of bailing on the first error, so a
+        # failed sibling operation can't commit behind our back
+        return_exceptions=True
     )
+    if isinstance(admin_result, Exception) or isinstance(collection_result, Exception):
+        # Roll back whatever did commit so a failed create leaves no trace;
+        # otherwise a duplicate email would strand the org document plus an
+        # orphan tenant collection that blocks future creates of this name.
+        # Deleting missing documents / dropping a missing collection is a
+        # no-op, so the cleanup is safe regardless of which side failed.
+        await asyncio.gather(
+            master_db["organizations"].delete_one({"_id": org_id}),
+            master_db["master_users"].delete_one({"_id": admin_id}),
+            mongo_client[settings.MASTER_DB_NAME].drop_collection(collection_name),
+            return_exceptions=True
+        )
+        if isinstance(admin_result, DuplicateKeyError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Admin email already registered for another organization"
+            )
+        raise admin_result if isinstance(admin_result, Exception) else collection_result
 
-    # 6. Dynamically create the new Mongo collection for the organization
-    mongo_client = get_mongo_client()
-    await mongo_client[settings.MASTER_DB_NAME].create_collection(collection_name)
-    
-    # 7. Return success response (refetch for complete data)
-    new_org = await master_db["organizations"].find_one({"_id": org_id})
-    return new_org
+    # 4. Return the locally-constructed document (no refetch round-trip)
+    return _org_response(org_doc, status_code=status.HTTP_201_CREATED)
 
 
 # --- Functional Requirement 2: Get Organization by Name (GET /org/get) ---
 @router.get("/get", response_model=OrganizationOut)
-async def get_organization(organization_name: str):
-    master_db = get_master_db()
+async def get_organization(organization_name: str, master_db=Depends(get_master_db)):
     organization = await master_db["organizations"].find_one(
-        {"organization_name": organization_name}
+        {"organization_name": organization_name}, _ORG_PROJECTION
     )
     if organization is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Organization not found"
         )
-    return organization
+    return _org_response(organization)
 
 
 # --- Functional Requirement 5: Admin Login (POST /admin/login) ---
 @router.post("/admin/login", response_model=Token)
-async def admin_login(admin_login_data: AdminLogin):
-    master_db = get_master_db()
-    
+async def admin_login(admin_login_data: AdminLogin, master_db=Depends(get_master_db)):
     # 1. Fetch user by email
     user_doc = await master_db["master_users"].find_one(
-        {"email": admin_login_data.email}
+        {"email": admin_login_data.email}, _LOGIN_PROJECTION
     )
     
     if not user_doc:
@@ -117,7 +153,7 @@ async def admin_login(admin_login_data: AdminLogin):
         )
         
     # 2. Validate password
-    if not verify_password(admin_login_data.password, user_doc["hashed_password"]):
+    if not await verify_password(admin_login_data.password, user_doc["hashed_password"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -141,38 +177,36 @@ async def admin_login(admin_login_data: AdminLogin):
 async def delete_organization(
     organization_name: str,
     # Authorization check: ensures user is logged in and returns their org_id
-    current_org_id: str = Depends(get_current_org_id)
+    current_org_id: ObjectId = Depends(get_current_org_id),
+    master_db=Depends(get_master_db),
+    mongo_client=Depends(get_mongo_client)
 ):
-    master_db = get_master_db()
-    
-    # 1. Fetch the organization to be deleted
-    organization = await master_db["organizations"].find_one(
-        {"organization_name": organization_name}
+    # 1. Atomically fetch-and-delete the organization. Filtering on both the
+    # token's org id and the requested name folds the read, the authorization
+    # check and the delete into a single round-trip, with the check enforced
+    # server-side instead of by a Python comparison.
+    organization = await master_db["organizations"].find_one_and_delete(
+        {"_id": current_org_id, "organization_name": organization_name},
+        _ORG_PROJECTION
     )
-    
+
     if organization is None:
+        # Either the organization does not exist or it belongs to a
+        # different admin; don't reveal which.
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Organization not found"
         )
-        
-    # 2. Authorization: Check if the authenticated user's org_id matches the requested org_id
-    if str(organization["_id"]) != current_org_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to delete this organization"
-        )
 
-    # 3. Delete Dynamic Collection
-    mongo_client = get_mongo_client()
+    # 2. Drop the dynamic collection and remove the org's users concurrently;
+    # the two operations are independent, so their round-trips overlap.
     collection_name = organization["collection_name"]
-    await mongo_client[settings.MASTER_DB_NAME].drop_collection(collection_name)
+    await asyncio.gather(
+        mongo_client[settings.MASTER_DB_NAME].drop_collection(collection_name),
+        master_db["master_users"].delete_many({"org_id": organization["_id"]})
+    )
 
-    # 4. Delete Master Records
-    await master_db["organizations"].delete_one({"_id": organization["_id"]})
-    await master_db["master_users"].delete_one({"org_id": organization["_id"]})
-    
-    return 
+    return
 
 
 # --- Functional Requirement 3: Update Organization (PUT /org/update) ---
@@ -184,40 +218,41 @@ async def delete_organization(
 async def update_organization(
     organization_name: str,
     new_org_name: Optional[str] = None,
-    current_org_id: str = Depends(get_current_org_id)
+    current_org_id: ObjectId = Depends(get_current_org_id),
+    master_db=Depends(get_master_db),
+    mongo_client=Depends(get_mongo_client)
 ):
-    master_db = get_master_db()
-    
-    # 1. Find the current organization
+    # 1. Find the current organization, filtering on the token's org id as
+    # well so the authorization check happens server-side. A miss returns
+    # 404 without revealing whether the org exists under another admin.
     organization = await master_db["organizations"].find_one(
-        {"organization_name": organization_name}
+        {"_id": current_org_id, "organization_name": organization_name}, _ORG_PROJECTION
     )
-    
+
     if organization is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Organization not found")
 
-    # 2. Authorization Check (using the Org ID from the token)
-    if str(organization["_id"]) != current_org_id:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to modify this organization")
-
     update_fields = {}
     
     if new_org_name and new_org_name != organization_name:
         
         # Check if the new name is already taken
-        if await master_db["organizations"].find_one({"organization_name": new_org_name}):
+        if await master_db["organizations"].find_one({"organization_name": new_org_name}, {"_id": 1}):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="New organization name already exists"
             )
             
         old_collection_name = organization["collection_name"]
-        new_collection_name = f"org_{new_org_name.lower().replace(' ', '_')}"
-        
-        # A. Rename the Dynamic Collection (Data Migration/Sync handled here)
-        mongo_client = get_mongo_client()
-        await mongo_client[settings.MASTER_DB_NAME].get_collection(old_collection_name).rename(new_collection_name)
-        
+        new_collection_name = _collection_name(new_org_name)
+
+        # A. Rename the Dynamic Collection (Data Migration/Sync handled here).
+        # Skip the rename when the normalized name is unchanged: names that
+        # differ only in case/whitespace map to the same collection, and
+        # Mongo rejects a rename onto the same name.
+        if new_collection_name != old_collection_name:
+            await mongo_client[settings.MASTER_DB_NAME].get_collection(old_collection_name).rename(new_collection_name)
+
         # B. Update master records
         update_fields["organization_name"] = new_org_name
         update_fields["collection_name"] = new_collection_name
@@ -228,8 +263,7 @@ async def update_organization(
             {"_id": organization["_id"]},
             {"$set": update_fields}
         )
-        # Fetch and return the updated document
-        updated_org = await master_db["organizations"].find_one({"_id": organization["_id"]})
-        return updated_org
-    
-    return organization # Return original if no changes were made
\ No newline at end of file
+        # Return the updated document without refetching
+        organization.update(update_fields)
+
+    return _org_response(organization)
\ No newline at end of file
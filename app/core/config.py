@@ -14,6 +14,9 @@ class Settings(BaseSettings):
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
 
+    # Password Hashing Settings
+    BCRYPT_ROUNDS: int = 12
+
     model_config = SettingsConfigDict(
         env_file=str(ENV_PATH),
         extra="ignore"
@@ -1,37 +1,83 @@
+import asyncio
+from functools import lru_cache
+
 import motor.motor_asyncio
 from app.core.config import settings
 
-# Global client variable to be initialized on startup
+# Global client and master-DB handle, both initialized on startup. The DB
+# handle is cached here so endpoints don't rebuild the Motor database proxy
+# (client[name]) on every request.
 client: motor.motor_asyncio.AsyncIOMotorClient = None
+master_db: motor.motor_asyncio.AsyncIOMotorDatabase = None
+
+# Connection pool sizing (explicit rather than driver defaults, so latency
+# stays bounded under burst load instead of paying lazy pool warm-up costs)
+MAX_POOL_SIZE = 100
+MIN_POOL_SIZE = 10
 
 async def connect_to_mongo():
-    global client
+    global client, master_db
     print("Connecting to MongoDB...")
     try:
-        # Connect to MongoDB
+        # Connect to MongoDB with an explicitly sized connection pool
         client = motor.motor_asyncio.AsyncIOMotorClient(
             settings.MONGO_URI,
-            serverSelectionTimeoutMS=5000
+            serverSelectionTimeoutMS=5000,
+            maxPoolSize=MAX_POOL_SIZE,
+            minPoolSize=MIN_POOL_SIZE,
+            maxIdleTimeMS=300_000,
+            maxConnecting=4,
+            retryWrites=True
+        )
+        # Validate the connection and warm up the pool with concurrent pings
+        # so the first real requests don't pay the connection-establishment cost
+        await asyncio.gather(
+            *[client.admin.command('ping') for _ in range(MIN_POOL_SIZE)]
         )
-        # The next line validates the connection
-        await client.admin.command('ping')
+        # Cache the master-DB handle once for the lifetime of the client
+        master_db = client[settings.MASTER_DB_NAME]
+        # Unique indexes enforce name/email uniqueness at the database level,
+        # so the create paths can insert directly instead of find-then-insert
+        await master_db["organizations"].create_index("organization_name", unique=True)
+        # collection_name is derived by normalizing the org name, so two
+        # names differing only in case/whitespace would collide; the unique
+        # index makes the second insert fail fast instead of sharing a tenant
+        # collection
+        await master_db["organizations"].create_index("collection_name", unique=True)
+        await master_db["master_users"].create_index("email", unique=True)
+        # Non-unique lookup index: org deletion removes users by org_id,
+        # which would otherwise be a collection scan
+        await master_db["master_users"].create_index("org_id")
         print("Connected to MongoDB!")
     except Exception as e:
         print(f"Failed to connect to MongoDB: {e}")
-        # Optionally, raise an exception or exit the application if the DB is critical
+        # The unique indexes are correctness-critical: the create paths rely
+        # on DuplicateKeyError instead of pre-checks, so serving traffic
+        # without them would silently admit duplicates. Abort startup.
+        raise
 
 async def close_mongo_connection():
-    global client
+    global client, master_db
     if client:
         client.close()
+        master_db = None
+        # Drop the memoized handles so a reconnect doesn't serve stale ones
+        get_master_db.cache_clear()
+        get_mongo_client.cache_clear()
         print("Closed MongoDB connection.")
 
+# Both getters are memoized: the handles are constant after startup, so the
+# None-check and global lookup run once. They double as FastAPI dependencies
+# (Depends(get_master_db)) in the routers.
+
+@lru_cache(maxsize=1)
 def get_master_db():
-    """Returns the Master Database client."""
-    if client is None:
+    """Returns the cached Master Database handle."""
+    if master_db is None:
         raise ConnectionError("MongoDB client is not initialized.")
-    return client[settings.MASTER_DB_NAME]
+    return master_db
 
+@lru_cache(maxsize=1)
 def get_mongo_client():
     """Returns the raw MongoDB client object."""
     if client is None:
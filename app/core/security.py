@@ -1,25 +1,40 @@
+import asyncio
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
+from bson import ObjectId
+from bson.errors import InvalidId
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+import jwt
+from jwt.exceptions import InvalidTokenError as JWTError
 from passlib.context import CryptContext
+from pydantic import ValidationError
 
 from app.core.config import settings
 from app.models.user import TokenData  # Import the TokenData model
 
 # --- Hashing Context ---
-# Use the bcrypt scheme for password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Use the bcrypt scheme for password hashing, with a configurable cost factor
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verifies a plain password against a hashed password."""
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verifies a plain password against a hashed password.
 
-def get_password_hash(password: str) -> str:
-    """Returns the bcrypt hash of a password."""
-    return pwd_context.hash(password)
+    Runs in a worker thread: bcrypt blocks for hundreds of milliseconds,
+    which would otherwise stall the event loop for all concurrent requests.
+    """
+    return await asyncio.to_thread(pwd_context.verify, plain_password, hashed_password)
+
+async def get_password_hash(password: str) -> str:
+    """Returns the bcrypt hash of a password (computed in a worker thread)."""
+    return await asyncio.to_thread(pwd_context.hash, password)
 
 
 # --- JWT Token Functions ---
@@ -47,9 +62,18 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 # Use the login URL for the token validation scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/admin/login")
 
-async def get_current_org_id(token: str = Depends(oauth2_scheme)) -> str:
+# Short-lived cache of already-verified tokens, so repeat requests within
+# the TTL skip the HMAC + base64 + JSON parse of a full decode. Entries
+# store the token's own exp alongside the org id and it is re-checked on
+# every hit, so a token is never honored past its expiry just because it
+# was cached shortly before it.
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+
+async def get_current_org_id(token: str = Depends(oauth2_scheme)) -> ObjectId:
     """
-    Dependency that decodes the JWT and returns the authenticated Organization ID.
+    Dependency that decodes the JWT and returns the authenticated Organization
+    ID as an ObjectId, so callers can filter on it directly without per-request
+    string conversions.
     Raises 401 Unauthorized if token is invalid or missing org_id.
     """
     credentials_exception = HTTPException(
@@ -57,7 +81,16 @@ async def get_current_org_id(token: str = Depends(oauth2_scheme)) -> str:
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+    # Fast path: token already verified recently and not yet expired.
+    # An expired entry falls through to the full decode, which raises the
+    # standard expiry error.
+    cached = _token_cache.get(token)
+    if cached is not None:
+        cached_org_id, exp = cached
+        if exp > time.time():
+            return cached_org_id
+
     try:
         # 1. Decode the token
         payload = jwt.decode(
@@ -73,10 +106,14 @@ async def get_current_org_id(token: str = Depends(oauth2_scheme)) -> str:
         if org_id is None or user_id is None:
             raise credentials_exception
             
-        # 3. Validate and return the organization ID
+        # 3. Validate, cache and return the organization ID
         token_data = TokenData(id=user_id, org_id=org_id)
-        return token_data.org_id
-        
-    except (JWTError, ValidationError):
+        org_oid = ObjectId(token_data.org_id)
+        exp = payload.get("exp")
+        if exp is not None:
+            _token_cache[token] = (org_oid, exp)
+        return org_oid
+
+    except (JWTError, ValidationError, InvalidId):
         # Catch JOSE errors and Pydantic validation errors
         raise credentials_exception
\ No newline at end of file
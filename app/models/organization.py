@@ -1,7 +1,6 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
-from datetime import datetime
-from bson import ObjectId
+from datetime import datetime, timezone
 from app.models.user import PyObjectId
 
 # Input model for POST /org/create
@@ -16,11 +15,11 @@ class OrganizationDB(BaseModel):
     organization_name: str
     collection_name: str
     admin_user_id: PyObjectId # Foreign key reference to AdminDB
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    # Timezone-aware UTC: datetime.utcnow is deprecated and its naive result
+    # is easy to misread as local time downstream
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
-    class Config:
-        populate_by_name = True
-        json_encoders = {ObjectId: str}
+    model_config = ConfigDict(populate_by_name=True)
 
 # Output model for GET /org/get
 class OrganizationOut(BaseModel):
@@ -29,5 +28,4 @@ class OrganizationOut(BaseModel):
     collection_name: str
     admin_user_id: str
     
-    class Config:
-        populate_by_name = True
\ No newline at end of file
+    model_config = ConfigDict(populate_by_name=True)
\ No newline at end of file
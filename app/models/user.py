@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, ConfigDict, Field, EmailStr
 from typing import Optional, Any
 from bson import ObjectId
 from pydantic_core import core_schema
@@ -27,15 +27,12 @@ class PyObjectId(ObjectId):
     def __get_pydantic_core_schema__(
         cls, source_type: Any, handler: Any
     ) -> core_schema.CoreSchema:
-        return core_schema.json_or_python_schema(
-            # Define how Pydantic handles Python objects (like dicts from Motor)
-            python_schema=core_schema.chain_schema([
-                core_schema.str_schema(),
-                core_schema.no_info_plain_validator_function(cls.validate),
-            ]),
-            # Define how Pydantic treats the value in JSON (i.e., a string)
-            json_schema=core_schema.str_schema(),
-            # Define how the Python object is serialized back to JSON (i.e., str(ObjectId))
+        # A single plain validator: cls.validate already fast-paths ObjectId
+        # instances and accepts strings, so the former str+chain schema just
+        # added an extra validator frame per field per deserialize.
+        return core_schema.no_info_plain_validator_function(
+            cls.validate,
+            # Serialize back to JSON as str(ObjectId)
             serialization=core_schema.to_string_ser_schema(),
         )
 
@@ -59,9 +56,7 @@ class AdminDB(BaseModel):
     hashed_password: str
     org_id: PyObjectId # Reference to the Organization in the master table
 
-    class Config:
-        populate_by_name = True
-        json_encoders = {ObjectId: str} # Ensure ObjectId is serialized to string
+    model_config = ConfigDict(populate_by_name=True)
 
 # Input for admin login
 class AdminLogin(BaseModel):
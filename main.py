@@ -1,13 +1,24 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 
+import uvloop
+
 from app.core.db import connect_to_mongo, close_mongo_connection
+from app.core.security import get_password_hash
 from app.api.v1.org import router as org_router
 
+# Use the libuv-backed event loop: the service is await-heavy Mongo I/O, so
+# a faster loop benefits every endpoint without code changes
+uvloop.install()
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup Events
     await connect_to_mongo()
+    # Force passlib to resolve its bcrypt backend now; otherwise the first
+    # login pays the lazy backend-detection cost on top of the hash itself
+    await get_password_hash("warmup")
     yield
     # Shutdown Events
     await close_mongo_connection()
@@ -16,7 +27,10 @@ async def lifespan(app: FastAPI):
 app = FastAPI(
     title="Organization Management Service",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson serializes several times faster than stdlib json and handles
+    # datetimes natively, which benefits every endpoint returning Mongo docs
+    default_response_class=ORJSONResponse
 )
 
 # Include the main router